@@ -1,6 +1,7 @@
 """contains get_rekordbox_library function and helpers"""
 
 import logging
+import sys
 import xml.etree.ElementTree as ET
 
 from utils import string_utils
@@ -40,9 +41,11 @@ def get_rekordbox_library(
 
     tree = get_tree_from_xml(rekordbox_xml_path)
     root = tree.getroot()
+    # track ids repeat across the collection and every playlist, so intern them to
+    # share one string per id and let dict/set lookups hit on identity
     rekordbox_collection_list = [
         RekordboxTrack(
-            id=track.get("TrackID"),
+            id=sys.intern(track.get("TrackID")),
             name=track.get("Name"),
             artist=track.get("Artist"),
             album=track.get("Album"),
@@ -82,7 +85,7 @@ def get_rekordbox_library(
                 RekordboxPlaylist(
                     name=playlist_name,
                     tracks=[
-                        track.get("Key")
+                        sys.intern(track.get("Key"))
                         for track in node.findall("TRACK")
                         if track.get("Key") in rekordbox_collection_id_set
                     ],
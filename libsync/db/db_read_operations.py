@@ -1,7 +1,10 @@
 import csv
 import logging
+import os
 import pickle
+from typing import Callable, Optional
 
+import orjson
 import spotipy.exceptions
 from db import db_utils, db_write_operations
 from utils import string_utils
@@ -29,10 +32,14 @@ def get_cached_spotify_search_results(
     spotify_search_cache_path = db_utils.get_spotify_search_cache_path(
         rekordbox_xml_path
     )
+    migrate_legacy_pickle_cache(
+        db_utils.get_legacy_spotify_search_cache_path(rekordbox_xml_path),
+        spotify_search_cache_path,
+    )
 
     try:
         with open(spotify_search_cache_path, "rb") as handle:
-            spotify_search_results = pickle.load(handle)
+            spotify_search_results = orjson.loads(handle.read())
             assert isinstance(spotify_search_results, dict)
             return spotify_search_results
 
@@ -40,7 +47,7 @@ def get_cached_spotify_search_results(
         logger.debug(error)
         logger.info(f"no cache found. creating cache at '{spotify_search_cache_path}'.")
 
-    except AssertionError as error:
+    except (AssertionError, orjson.JSONDecodeError) as error:
         logger.debug(error)
         string_utils.print_libsync_status_error(
             f"error parsing cache at '{spotify_search_cache_path}'. replacing cache file."
@@ -51,6 +58,81 @@ def get_cached_spotify_search_results(
     return {}
 
 
+def get_cached_spotify_song_details() -> dict[str, object]:
+    """get cached spotify track details. track details don't depend on the rekordbox
+    library, so one cache is shared across xml files.
+    this has a side effect of creating an empty cache if no cache is found, or the cache is invalid.
+
+    Returns:
+        dict[str, object]: results from API calls from previous libsync runs,
+          indexed by spotify track URI
+    """
+
+    spotify_song_details_cache_path = db_utils.get_spotify_song_details_cache_path()
+
+    try:
+        with open(spotify_song_details_cache_path, "rb") as handle:
+            spotify_song_details = orjson.loads(handle.read())
+            assert isinstance(spotify_song_details, dict)
+            return spotify_song_details
+
+    except FileNotFoundError as error:
+        logger.debug(error)
+        logger.info(
+            f"no cache found. creating cache at '{spotify_song_details_cache_path}'."
+        )
+
+    except (AssertionError, orjson.JSONDecodeError) as error:
+        logger.debug(error)
+        string_utils.print_libsync_status_error(
+            f"error parsing cache at '{spotify_song_details_cache_path}'. replacing cache file."
+        )
+
+    # if getting cache failed, create empty cache and return empty dict
+    db_write_operations.save_cached_spotify_song_details({})
+    return {}
+
+
+def migrate_legacy_pickle_cache(
+    legacy_cache_path: str,
+    cache_path: str,
+    convert_cache: Optional[Callable[[object], dict[str, object]]] = None,
+) -> None:
+    """one-time conversion of an old pickle cache to the json cache.
+    the old file is renamed so it is never unpickled again.
+
+    Args:
+        legacy_cache_path (str): path to the old pickle cache
+        cache_path (str): path to the json cache
+        convert_cache (Optional[Callable[[object], dict[str, object]]]): turns the
+          unpickled cache into json-serializable data. the cache is written as is
+          if not given
+    """
+
+    if os.path.isfile(cache_path) or not os.path.isfile(legacy_cache_path):
+        return
+
+    logger.info(f"migrating legacy cache at '{legacy_cache_path}' to json")
+    try:
+        with open(legacy_cache_path, "rb") as handle:
+            cache = pickle.load(handle)
+
+        if convert_cache is not None:
+            cache = convert_cache(cache)
+        db_write_operations.write_json_cache(cache_path, cache)
+
+    # unpickling, converting and serializing an old file can fail in too many ways
+    # to list - skip the migration on any of them so the file still gets renamed and
+    # isn't retried (and crashed on) every run
+    except Exception as error:
+        logger.exception(error)
+        string_utils.print_libsync_status_error(
+            f"error parsing legacy cache at '{legacy_cache_path}'. skipping migration."
+        )
+
+    os.replace(legacy_cache_path, f"{legacy_cache_path}.migrated")
+
+
 def get_playlist_id_map(
     rekordbox_xml_path: str,
 ) -> dict[str, str]:
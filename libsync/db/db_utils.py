@@ -1,3 +1,5 @@
+import functools
+
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 
@@ -14,17 +16,27 @@ def get_user_spotify_playlists_list_db_path(user_id: str) -> str:
 
 
 def get_spotify_search_cache_path(rekordbox_xml_path: str) -> str:
+    return f"data/libsync_search_results_cache_{get_sanitized_xml_path(rekordbox_xml_path)}.json"
+
+
+def get_legacy_spotify_search_cache_path(rekordbox_xml_path: str) -> str:
     return f"data/libsync_search_results_cache_{get_sanitized_xml_path(rekordbox_xml_path)}.db"
 
 
+def get_spotify_song_details_cache_path() -> str:
+    return "data/libsync_spotify_song_details_cache.json"
+
+
 def get_libsync_song_mapping_csv_path(rekordbox_xml_path: str) -> str:
     return f"data/libsync_song_mapping_cache_{get_sanitized_xml_path(rekordbox_xml_path)}.csv"
 
 
+@functools.lru_cache(maxsize=32)
 def get_sanitized_xml_path(xml_path: str) -> str:
     return xml_path.replace("/", "_")
 
 
+@functools.lru_cache(maxsize=None)
 def get_spotify_user_id() -> str:
     scope = [
         "user-library-read",
@@ -1,7 +1,8 @@
 import csv
 import logging
-import pickle
+import os
 
+import orjson
 from db import db_read_operations, db_utils
 from utils.rekordbox_library import RekordboxLibrary
 
@@ -11,7 +12,7 @@ logger = logging.getLogger("libsync")
 def save_cached_spotify_search_results(
     spotify_search_results: dict[str, object], rekordbox_xml_path: str
 ):
-    """save cached spotify search results in pickle format to save time next run
+    """save cached spotify search results in json format to save time next run
 
     Args:
         spotify_search_results (dict[str, object]): results from API calls,
@@ -25,8 +26,39 @@ def save_cached_spotify_search_results(
     )
 
     logger.debug("save_cached_spotify_search_results")
-    with open(spotify_search_cache_path, "wb") as handle:
-        pickle.dump(spotify_search_results, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    write_json_cache(spotify_search_cache_path, spotify_search_results)
+
+
+def save_cached_spotify_song_details(spotify_song_details: dict[str, object]):
+    """save cached spotify track details in json format to save time next run
+
+    Args:
+        spotify_song_details (dict[str, object]): results from API calls,
+          indexed by spotify track URI
+    """
+
+    spotify_song_details_cache_path = db_utils.get_spotify_song_details_cache_path()
+
+    logger.debug("save_cached_spotify_song_details")
+    write_json_cache(spotify_song_details_cache_path, spotify_song_details)
+
+
+def write_json_cache(cache_path: str, data: dict[str, object]) -> None:
+    """write a cache as json. writes to a temp file and renames it into place so a
+    crash mid-write can't leave a truncated cache behind
+
+    Args:
+        cache_path (str): path to the json cache
+        data (dict[str, object]): json-serializable cache contents
+    """
+
+    # serialize first so unserializable data doesn't leave a stray temp file behind
+    contents = orjson.dumps(data)
+    cache_temp_path = f"{cache_path}.tmp"
+    with open(cache_temp_path, "wb") as handle:
+        handle.write(contents)
+
+    os.replace(cache_temp_path, cache_path)
 
 
 def save_list_of_user_playlists(playlist_id_map: dict[str, str]) -> None:
@@ -2,9 +2,10 @@
 
 import logging
 import os
-import pickle
 from datetime import timedelta
 
+import orjson
+from db import db_read_operations, db_write_operations
 from id.download_audio import download_mp3_from_youtube_url
 from id.youtube_dl_utils import get_mp3_output_path, get_youtube_video_id_from_url
 from ShazamAPI import Shazam
@@ -51,7 +52,7 @@ def get_track_ids_from_audio_file(recording_audio_file_path: str) -> None:
         recording_audio_file_path (str): path to audio file to analyze
     """
 
-    libsync_cache_path = f"{recording_audio_file_path}_libsync_shazam_cache.db"
+    libsync_cache_path = f"{recording_audio_file_path}_libsync_shazam_cache.json"
     logger.info(
         "get_track_ids_from_audio_file with args "
         + f"recording_audio_file_path: {recording_audio_file_path}, "
@@ -60,10 +61,18 @@ def get_track_ids_from_audio_file(recording_audio_file_path: str) -> None:
     shazam_matches_by_url = {}
     shazam_urls_in_order = []
 
+    db_read_operations.migrate_legacy_pickle_cache(
+        f"{recording_audio_file_path}_libsync_shazam_cache.db",
+        libsync_cache_path,
+        lambda cache: get_serializable_shazam_cache(
+            cache["shazam_matches_by_url"], cache["shazam_urls_in_order"]
+        ),
+    )
+
     # get libsync cache from file
     try:
         with open(libsync_cache_path, "rb") as handle:
-            cache = pickle.load(handle)
+            cache = orjson.loads(handle.read())
             (
                 shazam_matches_by_url,
                 shazam_urls_in_order,
@@ -71,23 +80,33 @@ def get_track_ids_from_audio_file(recording_audio_file_path: str) -> None:
                 cache["shazam_matches_by_url"],
                 cache["shazam_urls_in_order"],
             )
+            for match in shazam_matches_by_url.values():
+                match["timestamps"] = [
+                    timedelta(seconds=seconds) for seconds in match["timestamps"]
+                ]
 
     except FileNotFoundError as error:
         logger.debug(error)
         string_utils.print_libsync_status_error(
             f"no cache found. creating cache at '{libsync_cache_path}'."
         )
-    except KeyError as error:
+    except (KeyError, orjson.JSONDecodeError) as error:
         logger.exception(error)
         string_utils.print_libsync_status_error(
             f"error parsing cache at '{libsync_cache_path}'. clearing cache."
         )
-        # TODO actually clear cache, also centralize this duplicated caching logic
+        shazam_matches_by_url = {}
+        shazam_urls_in_order = []
+        # TODO centralize this duplicated caching logic
 
-    input_file = open(recording_audio_file_path, "rb").read()
-    shazam = Shazam(input_file)
-    recognize_generator = shazam.recognizeSong()
     if len(shazam_urls_in_order) == 0 or FORCE_REDO_SHAZAM:
+        # only read the recording into memory when shazam actually needs it -
+        # a warm cache skips reading the whole (potentially huge) audio file
+        with open(recording_audio_file_path, "rb") as handle:
+            input_file = handle.read()
+
+        shazam = Shazam(input_file)
+        recognize_generator = shazam.recognizeSong()
         while True:
             try:
                 result = next(recognize_generator)
@@ -113,15 +132,11 @@ def get_track_ids_from_audio_file(recording_audio_file_path: str) -> None:
                 logger.info("reached end of file.")
                 break
 
-    # save matches
-    with open(libsync_cache_path, "wb") as handle:
-        pickle.dump(
-            {
-                "shazam_matches_by_url": shazam_matches_by_url,
-                "shazam_urls_in_order": shazam_urls_in_order,
-            },
-            handle,
-            protocol=pickle.HIGHEST_PROTOCOL,
+        # save matches - only needed when shazam ran, since the cache is unchanged
+        # otherwise
+        db_write_operations.write_json_cache(
+            libsync_cache_path,
+            get_serializable_shazam_cache(shazam_matches_by_url, shazam_urls_in_order),
         )
 
     # PRINT RESULTS
@@ -136,3 +151,31 @@ def get_track_ids_from_audio_file(recording_audio_file_path: str) -> None:
             print(
                 f"{num_matches:3} {str(timestamp)} {subtitle:30} - {title:30}{url_component}"
             )
+
+
+def get_serializable_shazam_cache(
+    shazam_matches_by_url: dict[str, dict],
+    shazam_urls_in_order: list[str],
+) -> dict[str, object]:
+    """convert shazam matches to json-serializable data, with timestamps in seconds
+
+    Args:
+        shazam_matches_by_url (dict[str, dict]): matches indexed by shazam url
+        shazam_urls_in_order (list[str]): shazam urls in order of first appearance
+
+    Returns:
+        dict[str, object]: cache contents to write as json
+    """
+
+    return {
+        "shazam_matches_by_url": {
+            url: {
+                **match,
+                "timestamps": [
+                    timestamp.total_seconds() for timestamp in match["timestamps"]
+                ],
+            }
+            for url, match in shazam_matches_by_url.items()
+        },
+        "shazam_urls_in_order": shazam_urls_in_order,
+    }
@@ -3,7 +3,6 @@ contains get_spotify_matches function and helpers
 """
 
 import logging
-import pprint
 import urllib.parse
 from typing import Iterable, Optional
 
@@ -52,10 +51,12 @@ def get_spotify_matches(
         rekordbox_to_spotify_map (dict[str, str]): reference to rekordbox_to_spotify_map argument
             which is modified in place
     """
-    logger.debug(
-        "running get_spotify_matches with rekordbox_library:\n"
-        + f"{pprint.pformat(rekordbox_library)}"
-    )
+    # dumping the whole library is expensive, so only build it when it gets logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "running get_spotify_matches with rekordbox_library:\n"
+            + f"{rekordbox_library.dump()}"
+        )
 
     logger.debug(
         "running sync_rekordbox_to_spotify.py with args: "
@@ -352,7 +353,7 @@ def get_cached_results_for_track(
 def get_spotify_queries_from_rb_track(
     rb_track: RekordboxTrack,
 ):
-    search_titles = get_name_varieties_from_track_name(rb_track.name)
+    search_titles = list(get_name_varieties_from_track_name(rb_track.name))
     search_artists = get_artists_from_rb_track(rb_track=rb_track)
     search_titles.extend([strip_punctuation(term) for term in search_titles])
     search_artists.extend([strip_punctuation(term) for term in search_artists])
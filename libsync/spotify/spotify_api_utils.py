@@ -1,137 +1,345 @@
 import asyncio
+import functools
+import itertools
 import logging
-from typing import Iterable
+import time
+import urllib.parse
+from typing import Awaitable, Callable, Iterable
 
 import aiohttp
-import requests
+import orjson
 from db import db_utils
 from spotipy.oauth2 import SpotifyOAuth
 from utils import constants, string_utils
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop isn't available on windows - fall back to the default event loop
+    uvloop = None
+
 logger = logging.getLogger("libsync")
 
+# access tokens by scope, as (token, expires_at)
+_access_tokens: dict[frozenset[str], tuple[str, float]] = {}
+
+
+# request helpers
+
+
+class SpotifyAdmissionController:
+    """limits the number of in-flight spotify api requests. the limit is halved
+    whenever spotify rate limits a request (429), and grows back by one after a run
+    of successful requests, up to max_concurrency.
+
+    use as `async with admission:` around each request. asyncio.Condition binds to
+    the event loop it's first used in, so create one per controller run.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.active = 0
+        self.consecutive_successes = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify(1)
+
+    async def record_response(self, status: int) -> None:
+        async with self.condition:
+            if status == 429:
+                self.limit = max(1, self.limit // 2)
+                self.consecutive_successes = 0
+                logger.debug(f"rate limited, lowering concurrency to {self.limit}")
+
+            elif status < 400:
+                self.consecutive_successes += 1
+                if (
+                    self.consecutive_successes
+                    >= constants.SPOTIFY_API_SUCCESSES_BEFORE_CONCURRENCY_INCREASE
+                    and self.limit < self.max_concurrency
+                ):
+                    self.limit += 1
+                    self.consecutive_successes = 0
+                    self.condition.notify_all()
+
+
+class SpotifyThrottle:
+    """paces spotify api requests to a steady rate across all controllers, and
+    holds every request back after a rate limited (429) response.
+
+    only touches the event loop through asyncio.sleep, so one instance can be
+    shared across asyncio.run calls.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1 / requests_per_second
+        self.next_available_at = 0.0
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now >= self.next_available_at:
+                self.next_available_at = now + self.interval
+                return
+
+            await asyncio.sleep(self.next_available_at - now)
+
+    def pause(self, seconds: float) -> None:
+        self.next_available_at = max(self.next_available_at, time.monotonic() + seconds)
+
+
+_throttle = SpotifyThrottle(constants.SPOTIFY_API_REQUESTS_PER_SECOND)
+
+
+def create_spotify_session(access_token: str) -> aiohttp.ClientSession:
+    """create a session for talking to the spotify api. connections are kept alive
+    and dns lookups cached for the life of the session, so all requests in a
+    controller run reuse the same pool. sessions are bound to the event loop they're
+    created in, so create one per asyncio.run
+
+    Args:
+        access_token (str): spotify api access token, sent with every request
+
+    Returns:
+        aiohttp.ClientSession: new session, to be used as an async context manager
+    """
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=constants.SPOTIFY_API_MAX_CONCURRENCY,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        ),
+        headers={"Authorization": f"Bearer {access_token}"},
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+    )
+
+
+async def request_spotify_api(session, admission, method, url, **kwargs):
+    """send a request to the spotify api, waiting out rate limited (429) responses
+
+    Args:
+        session (aiohttp.ClientSession): session to send the request with
+        admission (SpotifyAdmissionController): limits concurrent requests
+        method (str): http method
+        url (str): spotify api url
+        **kwargs: passed through to session.request (params, json)
+
+    Raises:
+        ConnectionError: if the request fails or is still rate limited after retrying
+
+    Returns:
+        parsed json body of the response (None if the body is empty)
+    """
+
+    for _ in range(constants.SPOTIFY_API_MAX_RETRIES):
+        async with admission:
+            await _throttle.acquire()
+            async with session.request(method, url, **kwargs) as response:
+                await admission.record_response(response.status)
+                if response.status == 429:
+                    # hold off every request, not just this one, so the retries
+                    # don't all land in the same burst
+                    retry_after = int(response.headers.get("Retry-After", "1"))
+                    logger.debug(f"rate limited on {url}, retrying in {retry_after}s")
+                    _throttle.pause(retry_after)
+
+                elif not response.ok:
+                    logger.debug(response)
+                    raise ConnectionError(f"spotify api request failed: {method} {url}")
+
+                else:
+                    return await response.json(loads=orjson.loads, content_type=None)
+
+    raise ConnectionError(f"spotify api request rate limited: {method} {url}")
+
+
+async def gather_with_limit(
+    coroutine_factories: Iterable[Callable[[], Awaitable]], limit: int
+) -> list:
+    """run coroutines with at most `limit` of them alive at once. unlike
+    asyncio.gather, coroutines are only created when a worker is free to run them,
+    so large batches don't allocate a coroutine per item up front
+
+    Args:
+        coroutine_factories (Iterable[Callable[[], Awaitable]]): zero-argument
+            callables (e.g. functools.partial) returning the coroutines to run
+        limit (int): max number of coroutines running at once
+
+    Returns:
+        list: results, in the same order as coroutine_factories
+    """
+
+    results = {}
+    pending = enumerate(coroutine_factories)
+
+    async def worker():
+        # workers share one iterator, so each factory is only picked up once
+        for index, coroutine_factory in pending:
+            results[index] = await coroutine_factory()
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(limit)]
+    try:
+        await asyncio.gather(*workers)
+
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        raise
+
+    return [results[index] for index in range(len(results))]
+
 
 # worker
 
 
-async def fetch_playlist_details_worker(session, access_token, playlist_id):
-    headers = {"Authorization": f"Bearer {access_token}"}
+async def fetch_playlist_details_worker(session, admission, playlist_id):
     url = f"https://api.spotify.com/v1/playlists/{playlist_id}"
-    params = {
-        "fields": "name,uri,tracks.total,tracks.items(track.id,track.name),tracks.limit"
-    }
-
-    async with session.get(url, headers=headers, params=params) as response:
-        if not response.ok:
-            logger.debug(response)
-            raise ConnectionError("fetching playlist failed")
+    params = {"fields": "tracks.total,tracks.limit,tracks.items(track.uri)"}
 
-        return playlist_id, await response.json()
+    return playlist_id, await request_spotify_api(
+        session, admission, "GET", url, params=params
+    )
 
 
 async def fetch_additional_tracks_worker(
-    session, access_token, playlist_id, limit, offset
+    session, admission, playlist_id, limit, offset
 ):
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks?limit={limit}&offset={offset}"
-    params = {"fields": "total,items(track.id,track.name),limit"}
+    url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
+    params = {"limit": limit, "offset": offset, "fields": "items(track.uri)"}
     try:
-        async with session.get(url, headers=headers, params=params) as response:
-            if not response.ok:
-                logger.debug(response)
-                raise ConnectionError("fetching additional tracks failed")
-
-            return playlist_id, limit, offset, await response.json()
+        result = await request_spotify_api(
+            session, admission, "GET", url, params=params
+        )
+        # only the uris are used, so don't keep the rest of the page around
+        return [item["track"]["uri"] for item in result["items"]]
 
     except ConnectionResetError as e:
         logger.debug(e)
         raise ConnectionError("fetching additional tracks failed") from e
 
 
-async def fetch_additional_playlists_worker(
-    session, access_token, user_id, limit, offset
-):
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://api.spotify.com/v1/users/{user_id}/playlists?limit={limit}&offset={offset}"
-    params = {"fields": "items(id,name)"}
-    async with session.get(url, headers=headers, params=params) as response:
-        if not response.ok:
-            logger.debug(response)
-            raise ConnectionError("fetching playlist failed")
+async def fetch_playlist_tracks_worker(session, admission, playlist_id):
+    _, playlist_info = await fetch_playlist_details_worker(
+        session, admission, playlist_id
+    )
+    tracks = playlist_info["tracks"]
+    limit = tracks["limit"]
 
-        return await response.json()
+    # fetch the rest of this playlist's pages as soon as the first page reports the
+    # total, instead of waiting on every other playlist's first page
+    follow_up_pages = await asyncio.gather(
+        *[
+            fetch_additional_tracks_worker(
+                session, admission, playlist_id, limit, offset
+            )
+            for offset in range(limit, tracks["total"], limit)
+        ]
+    )
 
+    track_uris = [item["track"]["uri"] for item in tracks["items"]]
+    for page_track_uris in follow_up_pages:
+        track_uris.extend(page_track_uris)
 
-# TODO: handle API errors and retries in this file
-async def overwrite_playlists_worker(
-    session, access_token, playlist_id, track_uri_list
-):
+    return playlist_id, track_uris
+
+
+async def fetch_user_playlists_worker(session, admission, user_id, limit, offset):
+    url = f"https://api.spotify.com/v1/users/{user_id}/playlists"
+    params = {"limit": limit, "offset": offset}
+    return await request_spotify_api(session, admission, "GET", url, params=params)
+
+
+async def overwrite_playlists_worker(session, admission, playlist_id, track_uri_list):
     logger.debug(
         f"clearing playlist: {playlist_id}, then adding {len(track_uri_list)} tracks."
     )
-    pages = [
-        track_uri_list[i : i + constants.SPOTIFY_API_ITEMS_PER_PAGE]
-        for i in range(0, len(track_uri_list), constants.SPOTIFY_API_ITEMS_PER_PAGE)
-    ]
-    if len(pages) < 1:
+    if len(track_uri_list) < 1:
         return []
 
     responses = []
-    headers = {"Authorization": f"Bearer {access_token}"}
     url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
 
     # first page
-    json = {"uris": []}
-    async with session.put(url, headers=headers, json=json) as response:
-        if not response.ok:
-            raise ConnectionError("updating playlist failed")
+    responses.append(
+        await request_spotify_api(session, admission, "PUT", url, json={"uris": []})
+    )
 
-        responses.append(await response.json())
+    # following pages, sliced off lazily rather than copied into a list of pages
+    track_uris = iter(track_uri_list)
+    while page := list(
+        itertools.islice(track_uris, constants.SPOTIFY_API_ITEMS_PER_PAGE)
+    ):
+        responses.append(
+            await request_spotify_api(
+                session, admission, "POST", url, json={"uris": page}
+            )
+        )
 
-    # following pages
-    for page in pages:
-        json = {"uris": page}
-        async with session.post(url, headers=headers, json=json) as response:
-            if not response.ok:
-                raise ConnectionError("updating playlist failed")
+    return responses
 
-            responses.append(await response.json())
 
-    return responses
+async def create_playlist_worker(
+    session, admission, user_id, rb_playlist_name, make_playlist_public
+):
+    url = f"https://api.spotify.com/v1/users/{user_id}/playlists"
+    body = {
+        "name": string_utils.generate_spotify_playlist_name(rb_playlist_name),
+        # TODO: private playlists don't work! read here:
+        # https://community.spotify.com/t5/Spotify-for-Developers/Api-to-create-a-private-playlist-doesn-t-work/td-p/5407807
+        "public": make_playlist_public,
+        "description": "Automatically generated by libsync",
+    }
+    result = await request_spotify_api(session, admission, "POST", url, json=body)
+    logger.info(f"created spotify playlist: {result['name']} with id: {result['id']}")
+    return rb_playlist_name, result["id"]
+
+
+async def unfollow_playlist_worker(session, admission, playlist_id):
+    logger.debug(f"deleting playlist with id: {playlist_id}")
+    # "unfollowing" your own playlist is the same as deleting it from the spotify UI.
+    # it's impossible to actually "delete" a spotify playlist.
+    url = f"https://api.spotify.com/v1/playlists/{playlist_id}/followers"
+    return await request_spotify_api(session, admission, "DELETE", url)
 
 
 async def fetch_spotify_song_details_worker(
-    session, access_token, list_of_sp_uris
-) -> list[str, str, str]:
-    headers = {"Authorization": f"Bearer {access_token}"}
+    session, admission, list_of_sp_uris
+) -> list[dict[str, object]]:
     list_of_sp_ids = [
         string_utils.get_spotify_id_from_uri(sp_uri) for sp_uri in list_of_sp_uris
     ]
-    url = f"https://api.spotify.com/v1/tracks?ids={'%2C'.join(list_of_sp_ids)}"
-    async with session.get(url, headers=headers) as response:
-        if not response.ok:
-            logger.debug(response)
-            raise ConnectionError("fetching song details failed", response)
-
-        logger.debug(f"response: {response}")
-        result = await response.json()
-        logger.debug(f"result: {result}")
-        return [[track["uri"], track] for track in result["tracks"]]
-
-    return [1, 2, 3]
+    url = "https://api.spotify.com/v1/tracks"
+    params = {"ids": ",".join(list_of_sp_ids)}
+    result = await request_spotify_api(session, admission, "GET", url, params=params)
+    logger.debug(f"result: {result}")
+    return result["tracks"]
 
 
-async def fetch_spotify_search_results_worker(session, access_token, query):
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://api.spotify.com/v1/search?q={query}&type=track"
+async def fetch_spotify_search_results_worker(session, admission, query):
+    url = "https://api.spotify.com/v1/search"
+    # queries are stored url encoded (they double as search cache keys), so decode
+    # them and let aiohttp do the encoding
+    params = {"q": urllib.parse.unquote_plus(query), "type": "track"}
 
     try:
-        async with session.get(url, headers=headers) as response:
-            if not response.ok:
-                logger.debug(response)
-                return query, None
+        result = await request_spotify_api(
+            session, admission, "GET", url, params=params
+        )
+        return query, result["tracks"]["items"]
 
-            return query, (await response.json())["tracks"]["items"]
+    except ConnectionError as e:
+        logger.debug(e)
+        return query, None
 
     except KeyError as e:
         logger.error(f"KeyError in fetch_spotify_search_results_worker: {e}")
@@ -141,7 +349,9 @@ async def fetch_spotify_search_results_worker(session, access_token, query):
 # controller
 
 
-async def fetch_playlist_details_controller(playlist_ids):
+async def fetch_user_playlists_details_controller(
+    playlist_ids: Iterable[str],
+) -> dict[str, list[str]]:
     access_token = get_spotify_access_token(
         [
             "user-library-read",
@@ -149,19 +359,26 @@ async def fetch_playlist_details_controller(playlist_ids):
             "playlist-read-collaborative",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            fetch_playlist_details_worker(session, access_token, playlist_id)
-            for playlist_id in playlist_ids
-        ]
-        playlist_info_list = await asyncio.gather(*tasks)
-        return {
-            playlist_id: playlist_info
-            for playlist_id, playlist_info in playlist_info_list
-        }
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        playlist_tracks_list = await gather_with_limit(
+            (
+                functools.partial(
+                    fetch_playlist_tracks_worker,
+                    session,
+                    admission,
+                    playlist_id,
+                )
+                for playlist_id in playlist_ids
+            ),
+            constants.SPOTIFY_API_MAX_CONCURRENCY,
+        )
+        return dict(playlist_tracks_list)
 
 
-async def fetch_additional_tracks_controller(params_list: list[list[str, int, int]]):
+async def fetch_all_user_playlists_controller(
+    user_id: str, expected_playlist_count: int
+) -> set[str]:
     access_token = get_spotify_access_token(
         [
             "user-library-read",
@@ -169,57 +386,130 @@ async def fetch_additional_tracks_controller(params_list: list[list[str, int, in
             "playlist-read-collaborative",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            fetch_additional_tracks_worker(
-                session, access_token, playlist_id, limit, offset
-            )
-            for playlist_id, limit, offset in params_list
-        ]
-        return await asyncio.gather(*tasks)
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    # this endpoint doesn't support `fields`, so fetch the largest pages it allows
+    limit = constants.SPOTIFY_API_PLAYLISTS_PER_PAGE
+
+    def fetch_pages(offsets: Iterable[int]):
+        return gather_with_limit(
+            (
+                functools.partial(
+                    fetch_user_playlists_worker,
+                    session,
+                    admission,
+                    user_id,
+                    limit,
+                    offset,
+                )
+                for offset in offsets
+            ),
+            constants.SPOTIFY_API_MAX_CONCURRENCY,
+        )
 
+    async with create_spotify_session(access_token) as session:
+        # request every page we expect to need up front, instead of waiting on the
+        # first page to report the total. only fetch more if the guess was short
+        expected_offsets = range(0, max(expected_playlist_count, 1), limit)
+        playlist_batches = await fetch_pages(expected_offsets)
+        total = playlist_batches[0]["total"]
+        playlist_batches.extend(
+            await fetch_pages(range(len(expected_offsets) * limit, total, limit))
+        )
 
-async def fetch_additional_playlists_controller(params_list: list[list[str, int, int]]):
+    return {
+        item["id"]
+        for playlist_batch in playlist_batches
+        for item in playlist_batch["items"]
+    }
+
+
+async def overwrite_playlists_controller(params_list: list[list[str, list[str]]]):
     access_token = get_spotify_access_token(
         [
             "user-library-read",
             "playlist-read-private",
             "playlist-read-collaborative",
+            "playlist-modify-private",
+            "playlist-modify-public",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            fetch_additional_playlists_worker(
-                session, access_token, user_id, limit, offset
-            )
-            for user_id, limit, offset in params_list
-        ]
-        return await asyncio.gather(*tasks)
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        return await gather_with_limit(
+            (
+                functools.partial(
+                    overwrite_playlists_worker,
+                    session,
+                    admission,
+                    playlist_id,
+                    track_uri_list,
+                )
+                for playlist_id, track_uri_list in params_list
+            ),
+            # each playlist is a sequential run of writes, so a few playlists at a
+            # time keeps the writes from bursting into rate limits
+            constants.SPOTIFY_PLAYLIST_WORKERS,
+        )
 
 
-async def overwrite_playlists_controller(params_list: list[list[str, list[str]]]):
+async def create_playlists_controller(
+    user_id: str, rb_playlist_names: list[str], make_playlists_public: bool
+) -> dict[str, str]:
     access_token = get_spotify_access_token(
         [
-            "user-library-read",
-            "playlist-read-private",
-            "playlist-read-collaborative",
             "playlist-modify-private",
             "playlist-modify-public",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            overwrite_playlists_worker(
-                session, access_token, playlist_id, track_uri_list
-            )
-            for playlist_id, track_uri_list in params_list
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        created_playlists = await gather_with_limit(
+            (
+                functools.partial(
+                    create_playlist_worker,
+                    session,
+                    admission,
+                    user_id,
+                    rb_playlist_name,
+                    make_playlists_public,
+                )
+                for rb_playlist_name in rb_playlist_names
+            ),
+            constants.SPOTIFY_PLAYLIST_WORKERS,
+        )
+
+    return dict(created_playlists)
+
+
+async def unfollow_playlists_controller(playlist_ids: Iterable[str]):
+    access_token = get_spotify_access_token(
+        [
+            "playlist-modify-private",
+            "playlist-modify-public",
         ]
-        return await asyncio.gather(*tasks)
+    )
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        return await gather_with_limit(
+            (
+                functools.partial(
+                    unfollow_playlist_worker,
+                    session,
+                    admission,
+                    playlist_id,
+                )
+                for playlist_id in playlist_ids
+            ),
+            constants.SPOTIFY_PLAYLIST_WORKERS,
+        )
 
 
 async def fetch_spotify_song_details_controller(
     spotify_uris: list[str],
 ) -> dict[str, dict[str, object]]:
+    # drop repeated uris (keeping order) so each track is only requested once
+    spotify_uris = list(dict.fromkeys(spotify_uris))
+
     # split the uris into batches of 100 - can run the batches in parallel
     batches = [
         spotify_uris[i : i + constants.SPOTIFY_API_ITEMS_PER_PAGE]
@@ -228,8 +518,6 @@ async def fetch_spotify_song_details_controller(
     if len(batches) < 1:
         return {}
 
-    spotify_song_details = {}
-
     access_token = get_spotify_access_token(
         [
             "user-library-read",
@@ -237,22 +525,28 @@ async def fetch_spotify_song_details_controller(
             "playlist-read-collaborative",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            fetch_spotify_song_details_worker(session, access_token, batch)
-            for batch in batches
-        ]
-        track_details_list = await asyncio.gather(*tasks)
-        return {
-            track_uri: track
-            for batch in track_details_list
-            for track_uri, track in batch
-        }
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        track_details_list = await gather_with_limit(
+            (
+                functools.partial(
+                    fetch_spotify_song_details_worker,
+                    session,
+                    admission,
+                    batch,
+                )
+                for batch in batches
+            ),
+            constants.SPOTIFY_API_MAX_CONCURRENCY,
+        )
 
-    return spotify_song_details
+    return {track["uri"]: track for batch in track_details_list for track in batch}
 
 
 async def fetch_spotify_search_results_controller(queries):
+    # the same query can come from several tracks - only search for it once
+    unique_queries = [query for query in dict.fromkeys(queries) if query]
+
     access_token = get_spotify_access_token(
         [
             "user-library-read",
@@ -260,17 +554,24 @@ async def fetch_spotify_search_results_controller(queries):
             "playlist-read-collaborative",
         ]
     )
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            fetch_spotify_search_results_worker(session, access_token, query)
-            for query in queries
-        ]
-        search_results_list = await asyncio.gather(*tasks)
-        return {
-            query: results
-            for query, results in search_results_list
-            if results is not None
-        }
+    admission = SpotifyAdmissionController(constants.SPOTIFY_API_MAX_CONCURRENCY)
+    async with create_spotify_session(access_token) as session:
+        search_results_list = await gather_with_limit(
+            (
+                functools.partial(
+                    fetch_spotify_search_results_worker,
+                    session,
+                    admission,
+                    query,
+                )
+                for query in unique_queries
+            ),
+            constants.SPOTIFY_API_MAX_CONCURRENCY,
+        )
+
+    return {
+        query: results for query, results in search_results_list if results is not None
+    }
 
 
 # driver
@@ -286,77 +587,53 @@ def get_user_playlists_details(playlists: Iterable[str]) -> dict[str, list]:
         dict[str, list]: map from spotify playlist id to list of spotify track URIs
     """
 
-    initial_playlist_info = asyncio.run(fetch_playlist_details_controller(playlists))
-    user_spotify_playlists = {}
-    follow_up_job_params = []
+    return run_async(fetch_user_playlists_details_controller(playlists))
 
-    for playlist_id, playlist_info in initial_playlist_info.items():
-        tracks = playlist_info["tracks"]
-        user_spotify_playlists[playlist_id] = [
-            item["track"]["id"] for item in tracks["items"]
-        ]
-        total = tracks["total"]
-        limit = tracks["limit"]
-        if total > limit:
-            follow_up_job_params.extend(
-                [[playlist_id, limit, offset] for offset in range(limit, total, limit)]
-            )
 
-    follow_up_playlist_tracks = asyncio.run(
-        fetch_additional_tracks_controller(follow_up_job_params)
+def get_all_user_playlists_set(expected_playlist_count: int = 0) -> set[str]:
+    """get ids of all of the user's spotify playlists, to check against deleted
+    playlists
+
+    Args:
+        expected_playlist_count (int): lower estimate of how many playlists the user
+          has (e.g. the number libsync created) - pages covering this many playlists
+          are fetched at once
+
+    Returns:
+        set[str]: spotify playlist ids
+    """
+
+    user_id = db_utils.get_spotify_user_id()
+    return run_async(
+        fetch_all_user_playlists_controller(user_id, expected_playlist_count)
     )
 
-    # sort by offset
-    follow_up_playlist_tracks.sort(key=lambda entry: entry[2])
 
-    for entry in follow_up_playlist_tracks:
-        user_spotify_playlists[entry[0]].extend(
-            [item["track"]["id"] for item in entry[3]["items"]]
-        )
+def overwrite_playlists(params_list: list[list[str, list[str]]]):
+    return run_async(overwrite_playlists_controller(params_list))
 
-    return user_spotify_playlists
 
+def create_playlists(
+    user_id: str, rb_playlist_names: list[str], make_playlists_public: bool
+) -> dict[str, str]:
+    """create a libsync spotify playlist for each rekordbox playlist name
 
-def get_all_user_playlists_set() -> set:
-    # get user playlists to check against deleted playlists
-    user_id = db_utils.get_spotify_user_id()
-    access_token = get_spotify_access_token(
-        [
-            "user-library-read",
-            "playlist-read-private",
-            "playlist-read-collaborative",
-        ]
-    )
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"https://api.spotify.com/v1/users/{user_id}/playlists"
-    params = {"fields": "total,items(id,name),limit"}
-    response = requests.get(url, headers=headers, params=params, timeout=10)
-    if not response.ok:
-        logger.debug(response)
-        raise ConnectionError("fetching playlist failed")
-
-    result = response.json()
-    total = result["total"]
-    limit = result["limit"]
-    all_user_playlists = {item["id"] for item in result["items"]}
-    follow_up_job_params = [
-        [user_id, limit, offset] for offset in range(limit, total, limit)
-    ]
-    follow_up_playlist_ids = asyncio.run(
-        fetch_additional_playlists_controller(follow_up_job_params)
-    )
-    all_user_playlists.update(
-        [
-            item["id"]
-            for playlist_batch in follow_up_playlist_ids
-            for item in playlist_batch["items"]
-        ]
+    Args:
+        user_id (str): spotify user id to create the playlists for
+        rb_playlist_names (list[str]): names of the rekordbox playlists
+        make_playlists_public (bool): determines if playlists will be made public or not
+
+    Returns:
+        dict[str, str]: map from rekordbox playlist name to new spotify playlist id
+    """
+
+    return run_async(
+        create_playlists_controller(user_id, rb_playlist_names, make_playlists_public)
     )
-    return all_user_playlists
 
 
-def overwrite_playlists(params_list: list[list[str, list[str]]]):
-    return asyncio.run(overwrite_playlists_controller(params_list))
+def unfollow_playlists(playlist_ids: Iterable[str]):
+    return run_async(unfollow_playlists_controller(playlist_ids))
 
 
 def get_spotify_song_details(spotify_uris: list[str]) -> dict[str, dict[str, object]]:
@@ -369,17 +646,56 @@ def get_spotify_song_details(spotify_uris: list[str]) -> dict[str, dict[str, obj
         dict[str, dict[str, object]]: map from spotify URI to spotify track json
     """
     logger.debug(f"running get_spotify_song_details with spotify_uris: {spotify_uris}")
-    return asyncio.run(fetch_spotify_song_details_controller(spotify_uris))
+    return run_async(fetch_spotify_song_details_controller(spotify_uris))
 
 
 def get_spotify_search_results(queries: list[str]):
     logger.debug(f"running get_spotify_search_results with queries: {queries}")
-    return asyncio.run(fetch_spotify_search_results_controller(queries))
+    return run_async(fetch_spotify_search_results_controller(queries))
 
 
 # misc
 
 
+def run_async(coroutine):
+    """run a controller coroutine to completion on a new event loop, using uvloop
+    where it's installed
+
+    Args:
+        coroutine (Coroutine): controller coroutine to run
+
+    Returns:
+        whatever the coroutine returns
+    """
+
+    if uvloop is not None:
+        return uvloop.run(coroutine)
+
+    return asyncio.run(coroutine)
+
+
 def get_spotify_access_token(scope: list[str]) -> str:
+    """get an access token for the spotify api. tokens are reused until they're
+    close to expiring, so controllers don't each go through SpotifyOAuth
+
+    Args:
+        scope (list[str]): spotify auth scopes the token needs
+
+    Returns:
+        str: spotify api access token
+    """
+
+    scope_key = frozenset(scope)
+    if scope_key in _access_tokens:
+        access_token, expires_at = _access_tokens[scope_key]
+        if time.time() < expires_at - constants.SPOTIFY_ACCESS_TOKEN_EXPIRY_MARGIN:
+            return access_token
+
     auth_manager = SpotifyOAuth(scope=scope)
-    return auth_manager.get_access_token(as_dict=False)
+    access_token = auth_manager.get_access_token(as_dict=False)
+    token_info = auth_manager.cache_handler.get_cached_token()
+    # without a known expiry there's nothing safe to cache against - ask again next time
+    if token_info and "expires_at" in token_info:
+        _access_tokens[scope_key] = (access_token, token_info["expires_at"])
+
+    return access_token
@@ -48,7 +48,9 @@ def sync_rekordbox_to_spotify(
         rekordbox_xml_path, create_collection_playlist
     )
     # TODO: this muddies up the logs quite a bit - might be worth removing
-    logger.debug(f"got rekordbox library: {rekordbox_library}")
+    # dumping the whole library is expensive, so only build it when it gets logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"got rekordbox library: {rekordbox_library.dump()}")
 
     # map songs from the user's rekordbox library onto spotify search results
     rekordbox_to_spotify_map = get_spotify_matches(
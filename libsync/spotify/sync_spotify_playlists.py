@@ -3,11 +3,11 @@
 import logging
 import pprint
 import time
+from collections import defaultdict
+from itertools import chain
 
-import spotipy
-from db import db_read_operations, db_write_operations
+from db import db_read_operations, db_utils, db_write_operations
 from spotify import spotify_api_utils
-from spotipy.oauth2 import SpotifyOAuth
 from utils import constants, string_utils
 from utils.rekordbox_library import RekordboxPlaylist
 
@@ -36,62 +36,51 @@ def sync_spotify_playlists(
         dict[str, str]: reference to playlist_id_map argument which is modified in place
     """
 
-    logger.debug(
-        "running sync_spotify_playlists with\n"
-        + f"rekordbox_playlists:\n{pprint.pformat(rekordbox_playlists)},\n"
-        + f"rekordbox_to_spotify_map:\n{pprint.pformat(rekordbox_to_spotify_map)}"
-    )
+    # dumping every playlist is expensive, so only build it when it gets logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "running sync_spotify_playlists with\n"
+            + "rekordbox_playlists:\n"
+            + "\n".join(playlist.dump() for playlist in rekordbox_playlists)
+            + ",\n"
+            + f"rekordbox_to_spotify_map:\n{pprint.pformat(rekordbox_to_spotify_map)}"
+        )
 
     string_utils.print_libsync_status("Fetching your Spotify playlists", level=1)
     playlist_id_map = db_read_operations.get_playlist_id_map(rekordbox_xml_path)
     libsync_owned_spotify_playlists = spotify_api_utils.get_user_playlists_details(
         playlist_id_map.values()
     )
-    all_user_spotify_playlists = spotify_api_utils.get_all_user_playlists_set()
+    all_user_spotify_playlists = spotify_api_utils.get_all_user_playlists_set(
+        len(playlist_id_map)
+    )
     rekordbox_playlists_set = {rb_playlist.name for rb_playlist in rekordbox_playlists}
     string_utils.print_libsync_status_success("Done", level=1)
 
     # delete invalid entries from playlist_id_map:
     #   playlist deleted from rekordbox, or playlist deleted from spotify
-    keys_to_delete_from_mapping = set()
-    spotify_playlist_ids_to_delete = set()
-    for rekordbox_playlist_name, spotify_playlist_id in playlist_id_map.items():
-        rb_playlist_valid = rekordbox_playlist_name in rekordbox_playlists_set
-        sp_playlist_valid = spotify_playlist_id in all_user_spotify_playlists
-        if sp_playlist_valid and not rb_playlist_valid:
-            keys_to_delete_from_mapping.add(rekordbox_playlist_name)
-            spotify_playlist_ids_to_delete.add(spotify_playlist_id)
-        if not sp_playlist_valid:
-            keys_to_delete_from_mapping.add(rekordbox_playlist_name)
+    deleted_from_rekordbox = playlist_id_map.keys() - rekordbox_playlists_set
+    deleted_from_spotify = {
+        rekordbox_playlist_name
+        for rekordbox_playlist_name, spotify_playlist_id in playlist_id_map.items()
+        if spotify_playlist_id not in all_user_spotify_playlists
+    }
+    keys_to_delete_from_mapping = deleted_from_rekordbox | deleted_from_spotify
+    # only delete spotify playlists that still exist
+    spotify_playlist_ids_to_delete = {
+        playlist_id_map[rekordbox_playlist_name]
+        for rekordbox_playlist_name in deleted_from_rekordbox - deleted_from_spotify
+    }
 
     for key in keys_to_delete_from_mapping:
         logger.debug(f"deleting playlist mapping for name: {key}")
         del playlist_id_map[key]
 
-    # TODO: centralize all this auth logic into a singleton class to avoid repeated auth
-    scope = [
-        "user-library-read",
-        "playlist-read-private",
-        "playlist-read-collaborative",
-        "playlist-modify-private",
-        "playlist-modify-public",
-    ]
-    auth_manager = SpotifyOAuth(scope=scope)
-    spotify = spotipy.Spotify(auth_manager=auth_manager)
-    user_id = spotify.current_user()["id"]
-
     if len(spotify_playlist_ids_to_delete) < 1:
         string_utils.print_libsync_status("No Spotify playlists to delete", level=1)
     else:
         string_utils.print_libsync_status("Deleting old Spotify playlists", level=1)
-
-        for playlist_id in spotify_playlist_ids_to_delete:
-            logger.debug(f"deleting playlist with id: {playlist_id}")
-            # TODO: parallelize this if necessary, shouldn't be a very hot path.
-            # "unfollowing" your own playlist is the same as deleting it from the spotify UI.
-            # it's impossible to actually "delete" a spotify playlist.
-            spotify.current_user_unfollow_playlist(playlist_id)
-
+        spotify_api_utils.unfollow_playlists(spotify_playlist_ids_to_delete)
         string_utils.print_libsync_status_success("Done", level=1)
 
     playlist_names_to_create = [
@@ -106,33 +95,26 @@ def sync_spotify_playlists(
     else:
         string_utils.print_libsync_status("Creating new Spotify playlists", level=1)
 
-        # TODO: parallelize this if necessary, shouldn't be a very hot path.
-        for rb_playlist_name in playlist_names_to_create:
-            # TODO: need better error handling for spotify API calls
-            #   (network failures, bad IDs, etc)
-            #   catch aiohttp.client_exceptions.ServerDisconnectedError in asyncio workers
-            playlist_create_result = spotify.user_playlist_create(
-                user=user_id,
-                name=string_utils.generate_spotify_playlist_name(rb_playlist_name),
-                # TODO: private playlists don't work! read here:
-                # https://community.spotify.com/t5/Spotify-for-Developers/Api-to-create-a-private-playlist-doesn-t-work/td-p/5407807
-                public=make_playlists_public,
-                description="Automatically generated by libsync",
-            )
-            logger.info(
-                f"created spotify playlist: {playlist_create_result['name']}"
-                + f" with id: {playlist_create_result['id']}"
+        # TODO: need better error handling for spotify API calls
+        #   (network failures, bad IDs, etc)
+        #   catch aiohttp.client_exceptions.ServerDisconnectedError in asyncio workers
+        playlist_id_map.update(
+            spotify_api_utils.create_playlists(
+                db_utils.get_spotify_user_id(),
+                playlist_names_to_create,
+                make_playlists_public,
             )
-            playlist_id_map[rb_playlist_name] = playlist_create_result["id"]
+        )
 
         string_utils.print_libsync_status_success("Done", level=1)
 
-    start_time = time.time()
-    # save mapping of playlists in a readable csv
-    db_write_operations.save_playlist_id_map(rekordbox_xml_path, playlist_id_map)
-    logger.debug(
-        f"time taken for save_list_of_user_playlists: {(time.time() - start_time):.3f} seconds"
-    )
+    # save mapping of playlists in a readable csv, if any mappings were removed or added
+    if len(keys_to_delete_from_mapping) >= 1 or len(playlist_names_to_create) >= 1:
+        start_time = time.time()
+        db_write_operations.save_playlist_id_map(rekordbox_xml_path, playlist_id_map)
+        logger.debug(
+            f"time taken for save_playlist_id_map: {(time.time() - start_time):.3f} seconds"
+        )
 
     spotify_playlist_write_jobs, new_spotify_additions = get_playlist_diffs(
         rekordbox_playlists,
@@ -168,15 +150,26 @@ def print_rekordbox_diff_report(
     string_utils.print_libsync_status(
         "Calculating songs to add to Rekordbox playlists", level=1
     )
-    spotify_song_details = spotify_api_utils.get_spotify_song_details(
-        list(
-            {
-                sp_uri
-                for tracklist in new_spotify_additions.values()
-                for sp_uri in tracklist
-            }
+    # track details rarely change, so only fetch details missing from the cache
+    spotify_song_details = db_read_operations.get_cached_spotify_song_details()
+    uncached_sp_uris = [
+        sp_uri
+        for sp_uri in dict.fromkeys(chain.from_iterable(new_spotify_additions.values()))
+        if sp_uri not in spotify_song_details
+    ]
+    logger.debug(f"len(uncached_sp_uris): {len(uncached_sp_uris)}")
+    if len(uncached_sp_uris) >= 1:
+        spotify_song_details.update(
+            spotify_api_utils.get_spotify_song_details(uncached_sp_uris)
         )
-    )
+        # the cache is shared across libraries and only ever grows (one entry per
+        # track ever reported), so only keep what the report prints. this also trims
+        # entries cached in full by older versions
+        spotify_song_details = {
+            sp_uri: get_reportable_spotify_track(track)
+            for sp_uri, track in spotify_song_details.items()
+        }
+        db_write_operations.save_cached_spotify_song_details(spotify_song_details)
 
     # TODO: there's an issue with the workflow of adding songs to spotify, and then adding them to
     # rekordbox. auto match may pick a different song than the one you added to spotify, leading to
@@ -186,34 +179,35 @@ def print_rekordbox_diff_report(
     # after it's been synced to spotify. libsync doesn't know it was deleted manually, so it will
     # report that the song is missing from the rekordbox playlist. need to keep track of rekordbox
     # collection history to track deletions
-    spotify_to_rekordbox_map = {
-        sp_uri: rb_track_id for rb_track_id, sp_uri in rekordbox_to_spotify_map.items()
-    }
-    logger.debug(f"spotify_to_rekordbox_map: {spotify_to_rekordbox_map}")
+    # only membership is checked, so the reverse map can just be a set of the values
+    sp_uris_in_rekordbox = set(rekordbox_to_spotify_map.values())
+    logger.debug(f"len(sp_uris_in_rekordbox): {len(sp_uris_in_rekordbox)}")
 
-    songs_to_playlists_diff_map = {}
+    songs_to_playlists_diff_map = defaultdict(list)
     for rb_playlist_name, sp_track_uris_to_add in new_spotify_additions.items():
         for sp_uri in sp_track_uris_to_add:
-            if sp_uri not in songs_to_playlists_diff_map:
-                songs_to_playlists_diff_map[sp_uri] = []
-
             songs_to_playlists_diff_map[sp_uri].append(rb_playlist_name)
 
-    new_songs_to_download = {
-        sp_uri
+    new_songs_to_download = songs_to_playlists_diff_map.keys() - sp_uris_in_rekordbox
+    # new tracks show up in both the download list and the by-track report, so
+    # pretty print each track once up front
+    pretty_tracks = {
+        sp_uri: string_utils.pretty_print_spotify_track(spotify_song_details[sp_uri])
         for sp_uri in songs_to_playlists_diff_map
-        if sp_uri not in spotify_to_rekordbox_map
     }
     string_utils.print_libsync_status_success("Done", level=1)
     if len(new_songs_to_download) < 1:
         string_utils.print_libsync_status("No new songs to download", level=1)
     else:
         string_utils.print_libsync_status("Download these songs:", level=1)
-        for sp_uri in new_songs_to_download:
-            print(
-                f"    {sp_uri} "
-                + f"{string_utils.pretty_print_spotify_track(spotify_song_details[sp_uri])}"
+        print(
+            "\n".join(
+                [
+                    f"    {sp_uri} {pretty_tracks[sp_uri]}"
+                    for sp_uri in new_songs_to_download
+                ]
             )
+        )
 
     string_utils.print_libsync_status(
         "Add these songs to your Rekordbox playlists:", level=1
@@ -234,27 +228,48 @@ def print_rekordbox_diff_report(
         print("    New tracks")
         print_rekordbox_diff_report_by_track(
             songs_to_playlists_diff_map_new_tracks,
-            spotify_song_details,
+            pretty_tracks,
         )
     if len(songs_to_playlists_diff_map_old_tracks) >= 1:
         print("\n    Tracks already in your collection")
         print_rekordbox_diff_report_by_track(
             songs_to_playlists_diff_map_old_tracks,
-            spotify_song_details,
+            pretty_tracks,
         )
 
     string_utils.print_libsync_status_success("Done", level=1)
 
 
-def print_rekordbox_diff_report_by_track(
-    songs_to_playlists_diff_map, spotify_song_details
-):
+def get_reportable_spotify_track(track: dict[str, object]) -> dict[str, object]:
+    """keep only the spotify track fields that pretty_print_spotify_track reads
+
+    Args:
+        track (dict[str, object]): spotify track json
+
+    Returns:
+        dict[str, object]: track json with just the name and artist names
+    """
+
+    return {
+        "name": track["name"],
+        "artists": (
+            None
+            if track["artists"] is None
+            else [{"name": artist["name"]} for artist in track["artists"]]
+        ),
+    }
+
+
+def print_rekordbox_diff_report_by_track(songs_to_playlists_diff_map, pretty_tracks):
+    # print the whole section at once instead of a line at a time
+    lines = []
     for sp_uri, rb_playlists in songs_to_playlists_diff_map.items():
-        print(
-            f"      {string_utils.pretty_print_spotify_track(spotify_song_details[sp_uri])}"
+        lines.append(f"      {pretty_tracks[sp_uri]}")
+        lines.extend(
+            [f"        {rb_playlist_name}" for rb_playlist_name in rb_playlists]
         )
-        for rb_playlist_name in rb_playlists:
-            print(f"        {rb_playlist_name}")
+
+    print("\n".join(lines))
 
 
 def get_filtered_spotify_uris_from_rekordbox_playlist(
@@ -302,13 +317,11 @@ def get_playlist_diffs(
             spotify_playlist_write_jobs.append([spotify_playlist_id, sp_uris_from_rb])
             continue
 
-        sp_uris_from_sp = [
-            string_utils.get_spotify_uri_from_id(spotify_track_id)
-            for spotify_track_id in libsync_owned_spotify_playlists[spotify_playlist_id]
-        ]
+        sp_uris_from_sp = libsync_owned_spotify_playlists[spotify_playlist_id]
         logger.debug(f"spotify uris from spotify playlist: {sp_uris_from_sp}")
+        sp_uris_from_rb_set = set(sp_uris_from_rb)
         sp_new_tracks = [
-            uri for uri in sp_uris_from_sp if uri not in set(sp_uris_from_rb)
+            uri for uri in sp_uris_from_sp if uri not in sp_uris_from_rb_set
         ]
         if len(sp_new_tracks) >= 1:
             # TODO: get details on tracks to add to spotify (artist, title, etc)
@@ -1,5 +1,6 @@
 """contains constants used across modules"""
 
+import re
 from enum import Enum
 
 
@@ -21,11 +22,28 @@ class InteractiveWorkflowCommands(str, Enum):
 
 # Constants
 
-ARTIST_LIST_DELIMITERS = r",| & |vs\.|\n|ft\.|feat\.|featuring| / |; "
+ARTIST_LIST_DELIMITERS_RE = re.compile(r",| & |vs\.|\n|ft\.|feat\.|featuring| / |; ")
+# bracketed variants come first so "(original mix)" goes as a whole, and the longer
+# bare variants come before "extended" so "extended mix" isn't left as " mix"
+SONG_TITLE_SUFFIXES_RE = re.compile(
+    r"[\(\[](?:original mix|original version|original|extended mix|extended version"
+    + r"|radio mix|radio edit|bootleg)[\)\]]"
+    + r"|original mix|original version|extended mix|extended version|extended"
+    + r"|radio mix|radio edit|bootleg",
+    flags=re.IGNORECASE,
+)
 NUMBER_OF_RESULTS_PER_QUERY = 5
 MINIMUM_SIMILARITY_THRESHOLD = 0.95
 SPOTIFY_TRACK_URI_PREFIX = "spotify:track:"
 SPOTIFY_API_ITEMS_PER_PAGE = 100
+SPOTIFY_API_PLAYLISTS_PER_PAGE = 50
+SPOTIFY_API_MAX_CONCURRENCY = 10
+SPOTIFY_API_SUCCESSES_BEFORE_CONCURRENCY_INCREASE = 10
+SPOTIFY_API_MAX_RETRIES = 5
+SPOTIFY_API_REQUESTS_PER_SECOND = 25
+SPOTIFY_PLAYLIST_WORKERS = 4
+# seconds before expiry to stop reusing a cached access token
+SPOTIFY_ACCESS_TOKEN_EXPIRY_MARGIN = 60
 
 NUM_SHAZAM_MATCHES_THRESHOLD = 5
 
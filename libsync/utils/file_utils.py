@@ -13,7 +13,7 @@ def export_failed_matches_to_file(failed_matches: list[RekordboxTrack]):
     """
 
     with open(
-        f"data/failed_matches_{datetime.now()}.txt".replace(" ", "_"),
+        f"data/failed_matches_{datetime.now().strftime('%Y.%m.%d_%H.%M.%S.%f')}.txt",
         "w",
         encoding="utf-8",
     ) as file:
@@ -17,6 +17,9 @@ class LibsyncCommand(str, Enum):
 class RekordboxTrack:
     """Relevant track info from rekordbox xml file"""
 
+    # a library holds tens of thousands of tracks, so skip the per-instance __dict__
+    __slots__ = ("id", "name", "artist", "album")
+
     def __init__(self, id, name, artist, album=None) -> None:
         self.id = id
         self.name = name
@@ -43,6 +46,10 @@ class RekordboxPlaylist:
         self.tracks = tracks
 
     def __repr__(self) -> str:
+        return f"Playlist object with name: {self.name}, {len(self.tracks)} tracks"
+
+    def dump(self) -> str:
+        """full description of the playlist, including every track ID"""
         return f"Playlist object with name: {self.name}, tracks: {self.tracks}"
 
     def __str__(self) -> str:
@@ -61,11 +68,19 @@ class RekordboxLibrary:
         self.playlists = playlists
 
     def __repr__(self) -> str:
+        return (
+            f"RekordboxLibrary object with xml_path: {self.xml_path}, "
+            + f"{len(self.collection)} tracks, {len(self.playlists)} playlists"
+        )
+
+    def dump(self) -> str:
+        """full description of the library, including every track and playlist"""
         return (
             "RekordboxLibrary object\n  "
             + f"xml_path:\n{self.xml_path}\n  "
             + f"collection:\n{pprint.pformat(self.collection)}\n  "
-            + f"playlists:\n{pprint.pformat(self.playlists)}"
+            + "playlists:\n"
+            + "\n".join(playlist.dump() for playlist in self.playlists)
         )
 
     def __str__(self) -> str:
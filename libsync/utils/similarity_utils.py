@@ -1,9 +1,11 @@
 """contains utility functions to compare two song results"""
 
+import functools
 import logging
 import unicodedata
-from difflib import SequenceMatcher
+from typing import Iterable
 
+from rapidfuzz import fuzz
 from utils.constants import DEBUG_SIMILARITY
 from utils.rekordbox_library import RekordboxTrack
 from utils.string_utils import (
@@ -29,13 +31,68 @@ def calculate_similarity_metric(similarity_matrix: dict):
 
 
 def get_string_similarity(string_1: str, string_2: str) -> float:
-    result = SequenceMatcher(None, string_1.lower(), string_2.lower()).ratio()
-    logger.debug(f"get_string_similarity: {result:3} for '{string_1}' vs '{string_2}'")
+    lowercase_string_1 = string_1.lower()
+    lowercase_string_2 = string_2.lower()
+    # similarity is symmetric, so order the pair to share cache entries
+    if lowercase_string_2 < lowercase_string_1:
+        result = get_lowercase_string_similarity(lowercase_string_2, lowercase_string_1)
+    else:
+        result = get_lowercase_string_similarity(lowercase_string_1, lowercase_string_2)
+
+    # this runs for every comparison, so skip building the message unless it's logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"get_string_similarity: {result:3} for '{string_1}' vs '{string_2}'"
+        )
     return result
 
 
+@functools.lru_cache(maxsize=200_000)
+def get_lowercase_string_similarity(string_1: str, string_2: str) -> float:
+    # the same artists and titles come up across many candidates, so cache scores
+    # rapidfuzz scores 0-100 - scale to 0-1 like the rest of the similarity metrics
+    return fuzz.ratio(string_1, string_2) / 100
+
+
+def get_best_string_similarity(string_pairs: Iterable[tuple[str, str]]) -> float:
+    """find the highest string similarity among string_pairs
+
+    Args:
+        string_pairs (Iterable[tuple[str, str]]): pairs of strings to compare
+
+    Returns:
+        float: highest similarity between 0 and 1, or 0 if there are no pairs
+    """
+    best_similarity = 0.0
+    for string_1, string_2 in string_pairs:
+        total_length = len(string_1) + len(string_2)
+        # a pair needs at least one edit per character of length difference, so the
+        # ratio can't beat 2 * shorter / total - skip pairs that can't win
+        if (
+            total_length
+            and 2 * min(len(string_1), len(string_2)) / total_length <= best_similarity
+        ):
+            continue
+        best_similarity = max(
+            best_similarity, get_string_similarity(string_1, string_2)
+        )
+
+    return best_similarity
+
+
 def remove_accents(input_str):
-    return unicodedata.normalize("NFKD", input_str)
+    # NFKD splits accented characters into base + combining mark, then drop the marks
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", input_str)
+        if not unicodedata.combining(char)
+    )
+
+
+@functools.lru_cache(maxsize=500_000)
+def normalize_song_name(song_name: str) -> str:
+    # the same names come up across many searches and playlists, so cache the result
+    return remove_accents(strip_punctuation(song_name)).strip()
 
 
 def calculate_similarities(
@@ -50,43 +107,43 @@ def calculate_similarities(
     Returns:
         dict: spotify track URI mapped to similarity value
     """
+    # the rekordbox side only depends on rb_track, so normalize it once up front
+    # TODO: handle (feat. Artist Name)
+    # TODO: handle '&' in artist names (at the spotify search level)
+    rekordbox_song_names = [
+        normalize_song_name(name)
+        for name in get_name_varieties_from_track_name(rb_track.name.lower())
+    ]
+    rekordbox_artist_list = [
+        artist.lower() for artist in get_artists_from_rb_track(rb_track=rb_track)
+    ]
+
     similarities = {}
     for spotify_track_uri, spotify_track_option in spotify_search_results.items():
         # normalize and clean up for best comparison
-        spotify_song_name = remove_accents(
-            strip_punctuation(remove_suffixes(spotify_track_option["name"]))
-        ).strip()
+        spotify_song_name = normalize_song_name(
+            remove_suffixes(spotify_track_option["name"])
+        )
         # TODO: test out remove_suffixes from the spotify name to get radio edits, etc
         # ideally, add logic to catch radio edits when nothing else is there,
         # but prefer the version that you have on rekordbox
-        # TODO: handle (feat. Artist Name)
-        # TODO: handle '&' in artist names (at the spotify search level)
-        rekordbox_song_names = [
-            remove_accents(strip_punctuation(name)).strip()
-            for name in get_name_varieties_from_track_name(rb_track.name.lower())
-        ]
 
         # name similarity
-        name_similarities = [
-            get_string_similarity(spotify_song_name, rekordbox_song_name)
+        best_name_similarity = get_best_string_similarity(
+            (spotify_song_name, rekordbox_song_name)
             for rekordbox_song_name in rekordbox_song_names
-        ]
+        )
 
         # artist similarity
         spotify_artist_list = [
             artist["name"] for artist in spotify_track_option["artists"]
         ]
-        rekordbox_artist_list = [
-            artist.lower() for artist in get_artists_from_rb_track(rb_track=rb_track)
-        ]
 
-        artist_similarities = [
-            get_string_similarity(spotify_artist, rekordbox_artist)
+        best_artist_similarity = get_best_string_similarity(
+            (spotify_artist, rekordbox_artist)
             for spotify_artist in spotify_artist_list
             for rekordbox_artist in rekordbox_artist_list
-        ]
-        best_name_similarity = max(name_similarities)
-        best_artist_similarity = max(artist_similarities)
+        )
         similarity = {
             "name_similarity": best_name_similarity,
             "artist_similarity": best_artist_similarity,
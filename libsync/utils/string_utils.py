@@ -1,13 +1,18 @@
 """utils for string operations and validation"""
 
-import re
 import string
 
 import spotipy.client
 from colorama import Fore, Style
-from utils.constants import ARTIST_LIST_DELIMITERS, SPOTIFY_TRACK_URI_PREFIX
+from utils.constants import (
+    ARTIST_LIST_DELIMITERS_RE,
+    SONG_TITLE_SUFFIXES_RE,
+    SPOTIFY_TRACK_URI_PREFIX,
+)
 from utils.rekordbox_library import RekordboxTrack
 
+PUNCTUATION_TRANSLATION_TABLE = str.maketrans("", "", string.punctuation)
+
 
 def get_spotify_uri_from_url(spotify_url: str) -> str:
     """parse spotify url
@@ -23,10 +28,6 @@ def get_spotify_uri_from_url(spotify_url: str) -> str:
     return spotify_uri
 
 
-def get_spotify_uri_from_id(spotify_track_id: str) -> str:
-    return SPOTIFY_TRACK_URI_PREFIX + spotify_track_id
-
-
 def get_spotify_id_from_uri(spotify_track_uri: str) -> str:
     assert is_spotify_uri(spotify_track_uri)
     return spotify_track_uri[len(SPOTIFY_TRACK_URI_PREFIX) :]
@@ -36,68 +37,29 @@ def is_spotify_uri(value: str) -> bool:
     return value.startswith(SPOTIFY_TRACK_URI_PREFIX)
 
 
-def remove_original_mix(song_title: str) -> str:
-    song_title = re.sub(
-        r"[\(\[]original mix[\)\]]", "", song_title, flags=re.IGNORECASE
-    )
-    song_title = re.sub(
-        r"[\(\[]original version[\)\]]", "", song_title, flags=re.IGNORECASE
-    )
-    song_title = re.sub(r"[\(\[]original[\)\]]", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"original mix", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"original version", "", song_title, flags=re.IGNORECASE)
-    return song_title
-
-
-def remove_extended_mix(song_title: str) -> str:
-    song_title = re.sub(
-        r"[\(\[]extended mix[\)\]]", "", song_title, flags=re.IGNORECASE
-    )
-    song_title = re.sub(r"extended mix", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(
-        r"[\(\[]extended version[\)\]]", "", song_title, flags=re.IGNORECASE
-    )
-    song_title = re.sub(r"extended version", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"extended", "", song_title, flags=re.IGNORECASE)
-    return song_title
-
-
-def remove_radio_mix(song_title: str) -> str:
-    song_title = re.sub(r"[\(\[]radio mix[\)\]]", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"[\(\[]radio edit[\)\]]", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"radio mix", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"radio edit", "", song_title, flags=re.IGNORECASE)
-    return song_title
-
-
-def remove_bootleg(song_title: str) -> str:
-    song_title = re.sub(r"[\(\[]bootleg[\)\]]", "", song_title, flags=re.IGNORECASE)
-    song_title = re.sub(r"bootleg", "", song_title, flags=re.IGNORECASE)
-    return song_title
-
-
 def remove_suffixes(song_title: str) -> str:
-    song_title = remove_original_mix(song_title)
-    song_title = remove_extended_mix(song_title)
-    song_title = remove_radio_mix(song_title)
-    song_title = remove_bootleg(song_title)
-    return song_title
+    return SONG_TITLE_SUFFIXES_RE.sub("", song_title)
+
 
+def get_name_varieties_from_track_name(name: str) -> tuple[str, ...]:
+    full_name = name.strip()
+    name_without_suffixes = remove_suffixes(name).strip()
+    if full_name == name_without_suffixes:
+        return (full_name,)
 
-def get_name_varieties_from_track_name(name: str):
-    return list(set(title.strip() for title in [name, remove_suffixes(name)]))
+    return (full_name, name_without_suffixes)
 
 
 def get_artists_from_rb_track(
     rb_track: RekordboxTrack,
 ):
     return [
-        artist.strip() for artist in re.split(ARTIST_LIST_DELIMITERS, rb_track.artist)
+        artist.strip() for artist in ARTIST_LIST_DELIMITERS_RE.split(rb_track.artist)
     ]
 
 
 def strip_punctuation(name: str) -> str:
-    return name.translate(str.maketrans("", "", string.punctuation))
+    return name.translate(PUNCTUATION_TRANSLATION_TABLE)
 
 
 def pretty_print_spotify_track(track: object, include_url: bool = False):